@@ -0,0 +1,373 @@
+"""This file contains a benchmark suite for the hot paths of our release
+tooling. It works fully offline by:
+1. Generating synthetic changelogs with a configurable number of releases
+2. Generating a local git repository with many commits and tags
+3. Timing parse, save, lookup and git operations and recording memory peaks
+4. Comparing the results against a stored baseline with a regression threshold
+
+Results are printed as JSON and the exit code is non-zero on regressions.
+"""
+
+import argparse
+import json
+import logging.config
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from changelog import Changelog, ReleaseLog
+from generate_release import find_release
+from git import Git
+from synthetic_changelog import generate_changelog_text
+
+config_path = Path.cwd() / "scripts" / "logging_config.ini"
+
+logging.config.fileConfig(config_path)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+DEFAULT_BASELINE = Path("scripts") / "release" / "benchmark_baseline.json"
+# Each timed run calls the function enough times to take at least this long,
+# as with timeit's autorange, so fast functions are not lost in timer noise
+MIN_RUN_SECONDS = 0.2
+# Large changelogs take seconds per run, so they are repeated less but
+# still enough times for the minimum to be stable
+MIN_REPEAT = 3
+
+
+def generate_git_repo(path: Path, commits: int, tag_every: int) -> None:
+    """Generates a local git repository using git fast-import so that
+    thousands of commits can be created in a few seconds
+
+    Args:
+        path (Path): directory to create the repository in
+        commits (int): number of commits to create
+        tag_every (int): create an annotated tag every n commits
+    """
+    subprocess.run(["git", "init", "-q", "-b", "stg", str(path)], check=True)
+    author = "bench <bench@example.com>"
+    stream = []
+    timestamp = 1735689600
+    for i in range(1, commits + 1):
+        content = f"change {i}\n".encode("utf-8")
+        message = f"Commit {i}".encode("utf-8")
+        stream.append(b"commit refs/heads/stg\n")
+        stream.append(f"mark :{i}\n".encode("utf-8"))
+        stream.append(f"committer {author} {timestamp + i} +0000\n".encode("utf-8"))
+        stream.append(b"data %d\n%s\n" % (len(message), message))
+        stream.append(f"M 644 inline file{i % 100}.txt\n".encode("utf-8"))
+        stream.append(b"data %d\n%s\n" % (len(content), content))
+        if i % tag_every == 0:
+            tag_message = f"Release v0.{i // tag_every}.0".encode("utf-8")
+            stream.append(f"tag v0.{i // tag_every}.0\n".encode("utf-8"))
+            stream.append(f"from :{i}\n".encode("utf-8"))
+            stream.append(f"tagger {author} {timestamp + i} +0000\n".encode("utf-8"))
+            stream.append(b"data %d\n%s\n" % (len(tag_message), tag_message))
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        input=b"".join(stream),
+        cwd=path,
+        check=True,
+    )
+    subprocess.run(["git", "checkout", "-q", "stg"], cwd=path, check=True)
+
+
+@contextmanager
+def working_directory(path: Path):
+    """Temporarily changes the working directory, as Git runs in the cwd
+
+    Args:
+        path (Path): directory to change to
+    """
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def time_calls(func, calls: int) -> float:
+    """Returns the total seconds taken to call a function a number of times
+
+    Args:
+        func (callable): function to call with no arguments
+        calls (int): number of calls
+
+    Returns:
+        float: total seconds taken
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return time.perf_counter() - start
+
+
+def autorange(func) -> int:
+    """Finds how many calls of a function take at least MIN_RUN_SECONDS,
+    doubling the number of calls each time like timeit's autorange
+
+    Args:
+        func (callable): function to call with no arguments
+
+    Returns:
+        int: number of calls to make in each timed run
+    """
+    calls = 1
+    while time_calls(func, calls) < MIN_RUN_SECONDS:
+        calls *= 2
+    return calls
+
+
+def measure(func, repeat: int) -> dict:
+    """Times a function and records its peak memory usage. Each timed run
+    makes enough calls to last at least MIN_RUN_SECONDS and the timings are
+    for a single call. Memory is measured in a separate call as tracemalloc
+    slows down the timed runs.
+
+    Args:
+        func (callable): function to benchmark, called with no arguments
+        repeat (int): number of timed runs
+
+    Returns:
+        dict: median and minimum seconds per call, the number of calls in
+            each run and the peak memory in bytes
+    """
+    calls = autorange(func)
+    timings = [time_calls(func, calls) / calls for _ in range(repeat)]
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "calls_per_run": calls,
+        "peak_bytes": peak,
+    }
+
+
+def changelog_benchmarks(workdir: Path, size: int) -> dict:
+    """Returns the changelog benchmarks for a changelog of a given size
+
+    Args:
+        workdir (Path): directory to write the synthetic changelog to
+        size (int): number of releases in the changelog
+
+    Returns:
+        dict: benchmark name -> function to benchmark
+    """
+    path = workdir / f"Changelog_{size}.md"
+    path.write_text(generate_changelog_text(size), encoding="UTF-8")
+    changelog = Changelog(path)
+    lines = changelog.load_file(path)
+    # Look up a release in the middle, as make_draft_release does
+    target = str(changelog.releases[(size + 1) // 2].version)
+
+    def parse():
+        changelog.releases = []
+        changelog.parse_file(lines)
+
+    def release_latest():
+        # Undo the release afterwards so each run releases the same version
+        releases = list(changelog.releases)
+        pending = releases[0]
+        changelog.release_latest(f"{size + 1}.0.0", "2026-01-01")
+        changelog.releases = releases
+        pending.type = ReleaseLog.Type.PENDING
+        pending.version = None
+        pending.date = None
+
+    return {
+        f"changelog.load[{size}]": lambda: Changelog(path),
+        f"changelog.parse[{size}]": parse,
+        f"changelog.save[{size}]": changelog.save_file,
+        f"changelog.format_diff_text[{size}]": changelog.format_diff_text,
+        f"changelog.find_release[{size}]": lambda: find_release(changelog, target),
+        f"changelog.release_latest[{size}]": release_latest,
+    }
+
+
+def git_benchmarks(repo: Path, commits: int) -> dict:
+    """Returns the git benchmarks for a generated repository
+
+    Args:
+        repo (Path): path to the generated repository
+        commits (int): number of commits in the repository
+
+    Returns:
+        dict: benchmark name -> function to benchmark
+    """
+    git = Git()
+
+    def in_repo(func, *args):
+        def run():
+            with working_directory(repo):
+                func(*args)
+
+        return run
+
+    return {
+        f"git.call[{commits}]": in_repo(git.status, "--short"),
+        f"git.log_latest[{commits}]": in_repo(git.log, "--pretty=format:'%h'", "-1"),
+        f"git.log_all[{commits}]": in_repo(git.log, "--pretty=format:%h %s"),
+        f"git.tag_list[{commits}]": in_repo(git.tag, "-l"),
+        f"git.branch[{commits}]": in_repo(git.branch),
+    }
+
+
+def compare(results: dict, baseline: dict, thresholds: dict) -> list[dict]:
+    """Compares results against a baseline
+
+    Args:
+        results (dict): benchmark name -> measurements
+        baseline (dict): benchmark name -> measurements from a previous run
+        thresholds (dict): metric -> allowed relative increase, i.e 0.25 for 25%
+
+    Returns:
+        list[dict]: measurements that regressed beyond the threshold
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        # The fastest run is the least affected by other load on the machine
+        for metric, threshold in thresholds.items():
+            if metric not in baseline[name]:
+                logging.warning(
+                    f"Baseline for {name} has no {metric}, skipping comparison"
+                )
+                continue
+            previous = baseline[name][metric]
+            current = result[metric]
+            if previous > 0 and current > previous * (1 + threshold):
+                regressions.append(
+                    {
+                        "benchmark": name,
+                        "metric": metric,
+                        "baseline": previous,
+                        "current": current,
+                        "change": current / previous - 1,
+                    }
+                )
+    return regressions
+
+
+def get_args():
+    """Parses and returns the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmarks the changelog and git tooling on synthetic data"
+            " and compares the results against a stored baseline."
+        )
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Number of releases in each synthetic changelog",
+    )
+    parser.add_argument(
+        "--commits", type=int, default=5000, help="Number of commits to generate"
+    )
+    parser.add_argument(
+        "--tag_every", type=int, default=50, help="Create a tag every n commits"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timed runs per benchmark"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline file to compare results against",
+    )
+    parser.add_argument(
+        "--save_baseline",
+        action="store_true",
+        help="Save the results as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="File to write the results to, defaults to stdout",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.0,
+        help=(
+            "Allowed relative slowdown before failing. Timings vary by tens of"
+            " percent between runs on shared machines, so this only catches"
+            " large regressions"
+        ),
+    )
+    parser.add_argument(
+        "--memory_threshold",
+        type=float,
+        default=0.1,
+        help="Allowed relative increase in peak memory before failing",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to run the benchmark suite."""
+    args = get_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for size in args.sizes:
+            logging.info(f"Benchmarking changelog with {size} releases")
+            repeat = args.repeat if size < 10000 else max(MIN_REPEAT, args.repeat // 5)
+            for name, func in changelog_benchmarks(workdir, size).items():
+                results[name] = measure(func, repeat)
+
+        logging.info(f"Benchmarking git with {args.commits} commits")
+        repo = workdir / "repo"
+        generate_git_repo(repo, args.commits, args.tag_every)
+        for name, func in git_benchmarks(repo, args.commits).items():
+            results[name] = measure(func, args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="UTF-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        logging.info(f"Saved baseline to {args.baseline}")
+        regressions = []
+    elif args.baseline.exists():
+        with open(args.baseline, "r", encoding="UTF-8") as file:
+            regressions = compare(
+                results,
+                json.load(file),
+                {"min_seconds": args.threshold, "peak_bytes": args.memory_threshold},
+            )
+    else:
+        logging.warning(f"No baseline found at {args.baseline}, skipping comparison")
+        regressions = []
+
+    report = json.dumps({"results": results, "regressions": regressions}, indent=2)
+    if args.output:
+        args.output.write_text(report, encoding="UTF-8")
+    else:
+        print(report)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
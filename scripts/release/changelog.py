@@ -15,6 +15,9 @@ config_path = Path.cwd() / "scripts" / "logging_config.ini"
 logging.config.fileConfig(config_path)
 
 DELIMITER = "---\n"
+# I will hardcode it to this repository for now, probably should
+# read this from some .env variable
+REPO_URL = "https://github.com/isaacchunn/wanderers"
 
 
 class ReleaseLog:
@@ -226,13 +229,11 @@ class Changelog:
         diff_text = []
         reversed_releases = list(reversed(self.releases))
         for i, release in enumerate(reversed_releases):
-            # I will hardcode it to this repository for now, probably should
-            # read this from some .env variable
             # First release
             if i == 0:
                 if release.version is not None:  # First release
                     diff_text.append(
-                        f"[{release.version}]: https://github.com/isaacchunn/wanderers/releases/tag/v{release.version}"  # pylint: disable=line-too-long
+                        f"[{release.version}]: {REPO_URL}/releases/tag/v{release.version}"
                     )
             else:
                 # Check to next release to see if we are at the last release
@@ -240,14 +241,14 @@ class Changelog:
                     # This is the unreleased section, so we should get the
                     # difference between this release and the HEAD of the repo
                     diff_text.append(
-                        f"[unreleased]: https://github.com/isaacchunn/wanderers/compare/"
+                        f"[unreleased]: {REPO_URL}/compare/"
                         f"v{reversed_releases[i-1].version}...HEAD"
                     )
                 else:
                     # This is a valid release so get the difference in tags
                     # between this release and the previous release
                     diff_text.append(
-                        f"[{reversed_releases[i].version}]: https://github.com/isaacchunn/wanderers/compare/"  # pylint: disable=line-too-long
+                        f"[{reversed_releases[i].version}]: {REPO_URL}/compare/"
                         f"v{reversed_releases[i-1].version}...v{reversed_releases[i].version}"
                     )
         return list(reversed(diff_text))
@@ -0,0 +1,665 @@
+"""This file contains a local fake of the GitHub API endpoints used by GitRepo
+(user, repo, releases and pulls), so the release process can be run and
+benchmarked without a token or network access. The server can:
+1. Fake the endpoints with in-memory state (default)
+2. Record the responses of the real GitHub API into a cassette file
+3. Replay a recorded cassette file
+It can also inject latency and errors. Errors are seeded per client, so each
+client sees the same failures on every run. Point GitRepo at it with base_url
+or GITHUB_API_URL in .env.
+"""
+
+import argparse
+import json
+import logging.config
+import math
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from changelog import Changelog
+from generate_release import create_pr, make_draft_release
+from git_repo import DEFAULT_BASE_URL
+from github import GithubRetry
+from synthetic_changelog import generate_changelog_text
+
+config_path = Path.cwd() / "scripts" / "logging_config.ini"
+
+logging.config.fileConfig(config_path)
+
+# Recorded responses refer to the server they came from with this placeholder
+BASE_URL_PLACEHOLDER = "{base_url}"
+# Same number of retries as the PyGithub default
+DEFAULT_RETRIES = 10
+
+
+class Cassette:
+    """This class stores recorded request/response pairs. Requests are
+    matched on method, path and body, and repeated requests are replayed
+    in the order they were recorded. Once a GET request runs out of
+    recordings its last response is reused, as reads do not change state."""
+
+    def __init__(self, path: Path) -> None:
+        """Called when cassette is created
+
+        Args:
+            path (Path): path to cassette file
+        """
+        self.path = path
+        self.interactions = []
+        self._positions = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, "r", encoding="UTF-8") as file:
+                self.interactions = json.load(file)
+
+    @staticmethod
+    def _key(method: str, path: str, body) -> str:
+        return json.dumps([method, path, body], sort_keys=True)
+
+    def record(self, interaction: dict) -> None:
+        """Records one interaction
+
+        Args:
+            interaction (dict): method, path and body of the request with
+                the status and JSON body of the response
+        """
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def replay(self, method: str, path: str, body) -> dict | None:
+        """Returns the next recorded interaction for a request
+
+        Args:
+            method (str): HTTP method of the request
+            path (str): path of the request
+            body (dict | None): JSON body of the request
+
+        Returns:
+            dict | None: recorded interaction, None if there are no more
+        """
+        key = self._key(method, path, body)
+        with self._lock:
+            matches = [
+                interaction
+                for interaction in self.interactions
+                if self._key(
+                    interaction["method"], interaction["path"], interaction["body"]
+                )
+                == key
+            ]
+            position = self._positions.get(key, 0)
+            if position >= len(matches):
+                return matches[-1] if matches and method == "GET" else None
+            self._positions[key] = position + 1
+            return matches[position]
+
+    def save(self) -> None:
+        """Saves the recorded interactions to the cassette file"""
+        with open(self.path, "w", encoding="UTF-8") as file:
+            json.dump(self.interactions, file, indent=2)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Passes every request on to the FakeGitHub that owns the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, payload = self.server.fake.handle(
+            self.command,
+            self.path,
+            body,
+            authorization=self.headers.get("Authorization"),
+            client=self.headers.get("User-Agent", ""),
+        )
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+class FakeGitHub:
+    """This class runs a local server that implements the GitHub API
+    endpoints used by GitRepo"""
+
+    class Mode(Enum):
+        """This enum represents where responses come from"""
+
+        FAKE = "fake"
+        RECORD = "record"
+        REPLAY = "replay"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        mode=Mode.FAKE,
+        cassette: Path = None,
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        upstream: str = DEFAULT_BASE_URL,
+        login: str = "wanderers-bot",
+    ) -> None:
+        """Called when fake server is created
+
+        Args:
+            mode (FakeGitHub.Mode): where responses come from
+            cassette (Path): cassette file, required to record or replay
+            port (int): port to listen on, 0 picks a free port
+            latency (float): seconds to wait before every response
+            error_rate (float): fraction of requests that fail with a 502
+            seed (int): seed deciding which requests fail
+            upstream (str): GitHub API to forward requests to when recording
+            login (str): login of the fake authenticated user
+        """
+        if mode != self.Mode.FAKE and cassette is None:
+            raise ValueError(f"A cassette file is needed to {mode.value}")
+        self.mode = mode
+        self.cassette = Cassette(cassette) if cassette else None
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.upstream = upstream.rstrip("/")
+        self.login = login
+
+        self.requests = 0
+        self.injected_errors = 0
+        self.releases = {}
+        self.pulls = {}
+        self._request_counts = {}
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+        self._routes = [
+            ("GET", re.compile(r"^/user$"), self._get_user),
+            ("GET", re.compile(r"^/repos/([^/]+)/([^/]+)$"), self._get_repo),
+            (
+                "GET",
+                re.compile(r"^/repos/([^/]+)/([^/]+)/releases$"),
+                self._list_releases,
+            ),
+            (
+                "POST",
+                re.compile(r"^/repos/([^/]+)/([^/]+)/releases$"),
+                self._create_release,
+            ),
+            (
+                "GET",
+                re.compile(r"^/repos/([^/]+)/([^/]+)/releases/(\d+)$"),
+                self._get_release,
+            ),
+            ("GET", re.compile(r"^/repos/([^/]+)/([^/]+)/pulls$"), self._list_pulls),
+            ("POST", re.compile(r"^/repos/([^/]+)/([^/]+)/pulls$"), self._create_pull),
+            (
+                "GET",
+                re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/(\d+)$"),
+                self._get_pull,
+            ),
+        ]
+
+    @property
+    def url(self) -> str:
+        """Base url of the server, to be passed to GitRepo"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHub":
+        """Starts serving requests on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Fake GitHub ({self.mode.value}) listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and saves the cassette when recording"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self.mode == self.Mode.RECORD:
+            self.cassette.save()
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _should_fail(self, client: str) -> bool:
+        """Decides whether to inject an error. Each request is identified
+        by its client and how many requests that client has made before it,
+        so a client that sends its requests in order sees the same failures
+        on every run. Clients sending requests concurrently should use
+        different User-Agent headers, else their requests share one count and
+        which of them fails depends on thread scheduling."""
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            count = self._request_counts.get(client, 0)
+            self._request_counts[client] = count + 1
+        return random.Random(f"{self.seed}:{client}:{count}").random() < self.error_rate
+
+    def handle(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        path: str,
+        body,
+        *,
+        authorization: str = None,
+        client: str = "",
+    ):
+        """Handles one request
+
+        Args:
+            method (str): HTTP method of the request
+            path (str): path of the request
+            body (dict | None): JSON body of the request
+            authorization (str): Authorization header, only used to record
+            client (str): User-Agent header, identifies the client when
+                deciding which requests fail
+
+        Returns:
+            tuple[int, dict | list | None]: status code and JSON body
+        """
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self._should_fail(client):
+            with self._lock:
+                self.injected_errors += 1
+            return 502, {"message": "Injected error from fake GitHub"}
+
+        # Request bodies can contain urls from earlier responses, so they
+        # are stored and matched with the placeholder too
+        if self.mode == self.Mode.RECORD:
+            status, payload = self._forward(method, path, body, authorization)
+            self.cassette.record(
+                {
+                    "method": method,
+                    "path": path,
+                    "body": self._to_placeholder(body),
+                    "status": status,
+                    "response": self._to_placeholder(payload),
+                }
+            )
+            return status, payload
+        if self.mode == self.Mode.REPLAY:
+            interaction = self.cassette.replay(method, path, self._to_placeholder(body))
+            if interaction is None:
+                return 404, {"message": f"No recorded response for {method} {path}"}
+            return interaction["status"], self._from_placeholder(
+                interaction["response"]
+            )
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path.split("?")[0])
+            if route_method == method and match:
+                with self._lock:
+                    return handler(body, *match.groups())
+        return 404, {"message": "Not Found"}
+
+    def _forward(self, method: str, path: str, body, authorization: str):
+        """Forwards a request to the real GitHub API"""
+        request = urllib.request.Request(
+            self.upstream + path,
+            data=None if body is None else json.dumps(body).encode("utf-8"),
+            method=method,
+            headers={"Accept": "application/vnd.github+json"},
+        )
+        request.add_header("Content-Type", "application/json")
+        if authorization:
+            request.add_header("Authorization", authorization)
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, data = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, data = e.code, e.read()
+        payload = json.loads(data) if data else None
+        return status, self._from_placeholder(self._to_placeholder(payload, True))
+
+    def _to_placeholder(self, payload, from_upstream=False):
+        """Replaces the server url in a payload with BASE_URL_PLACEHOLDER"""
+        text = json.dumps(payload)
+        text = text.replace(
+            self.upstream if from_upstream else self.url, BASE_URL_PLACEHOLDER
+        )
+        return json.loads(text)
+
+    def _from_placeholder(self, payload):
+        """Replaces BASE_URL_PLACEHOLDER in a payload with the server url"""
+        return json.loads(json.dumps(payload).replace(BASE_URL_PLACEHOLDER, self.url))
+
+    def _user_payload(self, login: str) -> dict:
+        return {
+            "login": login,
+            "id": 1,
+            "type": "User",
+            "url": f"{self.url}/users/{login}",
+            "html_url": f"{self.url}/{login}",
+        }
+
+    def _repo_payload(self, owner: str, repo: str) -> dict:
+        return {
+            "id": 1,
+            "name": repo,
+            "full_name": f"{owner}/{repo}",
+            "description": "Fake repository served by fake_github.py",
+            "owner": self._user_payload(owner),
+            "private": False,
+            "url": f"{self.url}/repos/{owner}/{repo}",
+            "html_url": f"{self.url}/{owner}/{repo}",
+            "default_branch": "stg",
+            "stargazers_count": 0,
+            "forks_count": 0,
+        }
+
+    def _get_user(self, _body):
+        return 200, self._user_payload(self.login)
+
+    def _get_repo(self, _body, owner, repo):
+        return 200, self._repo_payload(owner, repo)
+
+    def _list_releases(self, _body, owner, repo):
+        return 200, list(reversed(self.releases.get(f"{owner}/{repo}", [])))
+
+    def _get_release(self, _body, owner, repo, release_id):
+        for release in self.releases.get(f"{owner}/{repo}", []):
+            if release["id"] == int(release_id):
+                return 200, release
+        return 404, {"message": "Not Found"}
+
+    def _create_release(self, body, owner, repo):
+        body = body or {}
+        releases = self.releases.setdefault(f"{owner}/{repo}", [])
+        tag_name = body.get("tag_name")
+        if not tag_name:
+            return 422, {"message": "Validation Failed", "errors": ["tag_name"]}
+        if any(release["tag_name"] == tag_name for release in releases):
+            return 422, {"message": "Validation Failed", "errors": ["already_exists"]}
+        release_id = len(releases) + 1
+        release = {
+            "id": release_id,
+            "tag_name": tag_name,
+            "name": body.get("name", tag_name),
+            "body": body.get("body", ""),
+            "draft": body.get("draft", False),
+            "prerelease": body.get("prerelease", False),
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "author": self._user_payload(self.login),
+            "url": f"{self.url}/repos/{owner}/{repo}/releases/{release_id}",
+            "html_url": f"{self.url}/{owner}/{repo}/releases/tag/{tag_name}",
+        }
+        releases.append(release)
+        return 201, release
+
+    def _list_pulls(self, _body, owner, repo):
+        return 200, list(reversed(self.pulls.get(f"{owner}/{repo}", [])))
+
+    def _get_pull(self, _body, owner, repo, number):
+        for pull in self.pulls.get(f"{owner}/{repo}", []):
+            if pull["number"] == int(number):
+                return 200, pull
+        return 404, {"message": "Not Found"}
+
+    def _create_pull(self, body, owner, repo):
+        body = body or {}
+        pulls = self.pulls.setdefault(f"{owner}/{repo}", [])
+        missing = [field for field in ("title", "head", "base") if not body.get(field)]
+        if missing:
+            return 422, {"message": "Validation Failed", "errors": missing}
+        for pull in pulls:
+            if (pull["head"]["ref"], pull["base"]["ref"]) == (
+                body["head"],
+                body["base"],
+            ):
+                return 422, {
+                    "message": "Validation Failed",
+                    "errors": [f"A pull request already exists for {body['head']}"],
+                }
+        number = len(pulls) + 1
+        pull = {
+            "id": number,
+            "number": number,
+            "state": "open",
+            "title": body["title"],
+            "body": body.get("body", ""),
+            "head": {"ref": body["head"]},
+            "base": {"ref": body["base"]},
+            "user": self._user_payload(self.login),
+            "url": f"{self.url}/repos/{owner}/{repo}/pulls/{number}",
+            "html_url": f"{self.url}/{owner}/{repo}/pull/{number}",
+        }
+        pulls.append(pull)
+        return 201, pull
+
+
+class _CountingRetry(GithubRetry):
+    """GithubRetry that counts the retries made by the current thread, so
+    the load test can tell which releases needed retries"""
+
+    counts = threading.local()
+
+    def increment(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        _CountingRetry.counts.value = getattr(_CountingRetry.counts, "value", 0) + 1
+        return super().increment(*args, **kwargs)
+
+
+def _percentile(timings: list, percent: float) -> float:
+    """Returns the nearest-rank percentile of sorted timings"""
+    return timings[max(0, math.ceil(percent * len(timings)) - 1)]
+
+
+def _step_timings(results: list) -> dict:
+    """Summarises the timings of each step of the successful releases"""
+    steps = {}
+    for step in ("make_draft_release", "create_pr"):
+        timings = sorted(result["timings"][step] for result in results)
+        if timings:
+            steps[step] = {
+                "median_seconds": statistics.median(timings),
+                "p95_seconds": _percentile(timings, 0.95),
+                "max_seconds": timings[-1],
+            }
+    return steps
+
+
+def run_load_test(
+    server: FakeGitHub, workers: int, iterations: int, retries: int = None
+) -> dict:
+    """Runs the GitHub steps of generate_release (make_draft_release and
+    create_pr to stg and prd) concurrently against a fake server, using a
+    synthetic changelog with one release per iteration. Each release sends
+    its requests in order with its own User-Agent, so with the same seed the
+    same requests of the same releases fail on every run.
+
+    Args:
+        server (FakeGitHub): running server to send requests to
+        workers (int): number of concurrent releases
+        iterations (int): total number of releases to make
+        retries (int): retries per request, None for the PyGithub default
+            and 0 to let injected errors fail the release
+
+    Returns:
+        dict: timings of each step, failed and retried releases and
+            request counts
+    """
+    git_repo_kwargs = {
+        "base_url": server.url,
+        "token": "fake-token",
+        # PyGithub throttling would otherwise dominate the timings
+        "seconds_between_requests": 0,
+        "seconds_between_writes": 0,
+    }
+    if retries is None:
+        retries = DEFAULT_RETRIES
+    git_repo_kwargs["retry"] = _CountingRetry(total=retries) if retries else None
+
+    def release(release_version: str) -> dict:
+        _CountingRetry.counts.value = 0
+        result = {"version": release_version, "timings": {}}
+        release_kwargs = {
+            **git_repo_kwargs,
+            "user_agent": f"load-test/{release_version}",
+        }
+        try:
+            start = time.perf_counter()
+            release_message, release_url = make_draft_release(
+                release_version, changelog_path, **release_kwargs
+            )
+            result["timings"]["make_draft_release"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for base in ("stg", "prd"):
+                create_pr(
+                    release_version,
+                    release_message,
+                    release_url,
+                    base=base,
+                    **release_kwargs,
+                )
+            result["timings"]["create_pr"] = time.perf_counter() - start
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["retries"] = _CountingRetry.counts.value
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        changelog_path = Path(tmp) / "Changelog.md"
+        changelog_path.write_text(generate_changelog_text(iterations), encoding="UTF-8")
+        versions = [
+            str(release.version) for release in Changelog(changelog_path).releases[1:]
+        ]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(release, versions))
+        total = time.perf_counter() - start
+
+    succeeded = [result for result in results if "error" not in result]
+    return {
+        "workers": workers,
+        "iterations": iterations,
+        "total_seconds": total,
+        "requests": server.requests,
+        "injected_errors": server.injected_errors,
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "retried_releases": sum(result["retries"] > 0 for result in results),
+        "failed_attempts": sum(result["retries"] for result in results),
+        "errors": [
+            {"version": result["version"], "error": result["error"]}
+            for result in results
+            if "error" in result
+        ],
+        "steps": _step_timings(succeeded),
+    }
+
+
+def get_args():
+    """Parses and returns the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Runs a local fake of the GitHub API used by GitRepo."
+            " Set GITHUB_API_URL in .env to the printed url to use it."
+        )
+    )
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in FakeGitHub.Mode],
+        default=FakeGitHub.Mode.FAKE.value,
+        help="Fake the API, record the real API or replay a recording",
+    )
+    parser.add_argument("--cassette", type=Path, help="File to record or replay")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait per request"
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that fail with a 502",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed deciding which requests fail"
+    )
+    parser.add_argument(
+        "--load_test",
+        action="store_true",
+        help="Run generate_release steps concurrently, print timings and exit",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=None,
+        help=(
+            "Retries per request in the load test, defaults to PyGithub's."
+            " Use 0 so that injected errors fail releases"
+        ),
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent releases in the load test"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="Releases to make in the load test"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to run the fake server or a load test against it."""
+    args = get_args()
+
+    server = FakeGitHub(
+        mode=FakeGitHub.Mode(args.mode),
+        cassette=args.cassette,
+        port=0 if args.load_test else args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with server:
+        if args.load_test:
+            summary = run_load_test(
+                server, args.workers, args.iterations, retries=args.retries
+            )
+            print(json.dumps(summary, indent=2))
+            sys.exit(1 if summary["failed"] else 0)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logging.info("Stopping fake GitHub")
+
+
+if __name__ == "__main__":
+    main()
@@ -134,23 +134,49 @@ def push_changes(release_version):
     git.push("--set-upstream", "origin", f"release-{release_version}")
 
 
-def make_draft_release(release_version):
+def get_release_record(release_version, changelog_path=Path("Changelog.md")):
+    """Gets the record of a release from the changelog
+
+    Args:
+        release_version (str): version of release
+        changelog_path (Path): path to changelog file
+
+    Returns:
+        ReleaseLog | None: record of the release if it exists, otherwise None
+    """
+    return find_release(Changelog(changelog_path), release_version)
+
+
+def find_release(changelog_file, release_version):
+    """Finds the record of a release in a loaded changelog
+
+    Args:
+        changelog_file (Changelog): changelog to search
+        release_version (str): version of release
+
+    Returns:
+        ReleaseLog | None: record of the release if it exists, otherwise None
+    """
+    for release in changelog_file.releases:
+        if release.version == version.parse(release_version):
+            return release
+    return None
+
+
+def make_draft_release(
+    release_version, changelog_path=Path("Changelog.md"), **git_repo_kwargs
+):
     """Makes a draft release on GitHub
 
     Args:
         release_version (str): version of release
+        changelog_path (Path): path to changelog file
+        git_repo_kwargs: passed on to GitRepo, i.e base_url
     """
     logging.info(f"Creating draft release for release {release_version}")
-    git_repo = GitRepo(REPO_NAME)
-
-    def get_release_record(release_version):
-        changelog_file = Changelog(Path("Changelog.md"))
-        for release in changelog_file.releases:
-            if release.version == version.parse(release_version):
-                return release
-        return None
+    git_repo = GitRepo(REPO_NAME, **git_repo_kwargs)
 
-    release_message = get_release_record(release_version)
+    release_message = get_release_record(release_version, changelog_path)
     release_url = git_repo.create_draft_release(
         f"v{release_version}", str(release_message)
     )
@@ -158,16 +184,18 @@ def make_draft_release(release_version):
     return str(release_message), release_url
 
 
-def create_pr(release_version, release_message, release_url, base):
+def create_pr(release_version, release_message, release_url, base, **git_repo_kwargs):
     """Creates a pull request for the release branch
 
     Args:
         release_version (str): version of release
         release_message (str): release notes message
         release_url (str): URL of the draft release
+        base (str): branch to merge the release branch into
+        git_repo_kwargs: passed on to GitRepo, i.e base_url
     """
     logging.info(f"Creating PR for release {release_version}")
-    git_repo = GitRepo(REPO_NAME)
+    git_repo = GitRepo(REPO_NAME, **git_repo_kwargs)
 
     pr_title = f"{REPO_NAME} release v{release_version}"
     pr_body = (
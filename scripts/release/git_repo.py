@@ -6,6 +6,8 @@ from github import Github
 
 config = dotenv_values(".env")
 
+DEFAULT_BASE_URL = "https://api.github.com"
+
 
 class GitRepo:
     """Class to interact with a GitHub repository using PyGithub.
@@ -13,21 +15,37 @@ class GitRepo:
     This class provides methods to create draft releases and pull requests
     on a specified GitHub repository.
 
+    The API can be pointed at another server (i.e the fake server in
+    fake_github.py) through base_url or GITHUB_API_URL in the .env file.
+    Any other keyword arguments are passed on to Github, i.e retry or
+    seconds_between_requests and seconds_between_writes, which can also be
+    set with GITHUB_SECONDS_BETWEEN_REQUESTS/WRITES in the .env file.
+
     Attributes:
         repo_name (str): The name of the GitHub repository.
         gh (Github): An authenticated GitHub instance.
         repo (Repository): The GitHub repository object.
     """
 
-    def __init__(self, repo_name: str):
+    def __init__(
+        self, repo_name: str, base_url: str = None, token: str = None, **github_kwargs
+    ):
         self.repo_name = repo_name
         # Try get token from config
-        git_token = config.get("GITHUB_TOKEN")
+        git_token = token or config.get("GITHUB_TOKEN")
         if git_token is None:
             raise ValueError("GitHub token not found in config. Update your .env file!")
+        base_url = base_url or config.get("GITHUB_API_URL") or DEFAULT_BASE_URL
+        # PyGithub throttles requests by default, which a fake server does not need
+        for key in ("seconds_between_requests", "seconds_between_writes"):
+            value = config.get(f"GITHUB_{key.upper()}")
+            if value is not None:
+                github_kwargs.setdefault(key, float(value))
         try:
             # Try to login to GitHub
-            self.gh = Github(login_or_token=git_token)
+            self.gh = Github(
+                login_or_token=git_token, base_url=base_url, **github_kwargs
+            )
         except Exception as exc:
             # If login fails, raise exception, this is not the correct exception though...
             raise ConnectionError(
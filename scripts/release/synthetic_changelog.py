@@ -0,0 +1,49 @@
+"""This file contains a generator for synthetic changelogs in the same format
+as Changelog.md, shared by the benchmark suite and the fake GitHub load test.
+"""
+
+from datetime import date, timedelta
+
+from changelog import REPO_URL, Changelog
+
+SECTIONS = ("Added", "Fixed", "Changed", "Removed")
+
+
+def generate_changelog_text(releases: int, entries: int = 3) -> str:
+    """Generates a changelog in the same format as Changelog.md
+
+    Args:
+        releases (int): number of released versions to generate
+        entries (int): number of entries in each section of a release
+
+    Returns:
+        str: text of the changelog
+    """
+    lines = [Changelog._FILE_HEADER]  # pylint: disable=protected-access
+    lines.append("## [Unreleased]\n\n")
+    for section in SECTIONS:
+        lines.append(f"### {section}\n\n")
+
+    release_date = date(2025, 1, 1)
+    versions = [f"{i // 10000}.{i // 100 % 100}.{i % 100}" for i in range(releases)]
+    for i, release_version in reversed(list(enumerate(versions))):
+        lines.append(
+            f"## [{release_version}] - "
+            f"{(release_date + timedelta(days=i)).isoformat()}\n\n"
+        )
+        for section in SECTIONS:
+            lines.append(f"### {section}\n\n")
+            for j in range(entries):
+                lines.append(f"- (BE/FE) {section} item {j} in {release_version}\n")
+            lines.append("\n")
+
+    lines.append("---\n")
+    if versions:
+        lines.append(f"[unreleased]: {REPO_URL}/compare/v{versions[-1]}...HEAD\n")
+    for i in range(len(versions) - 1, 0, -1):
+        lines.append(
+            f"[{versions[i]}]: {REPO_URL}/compare/v{versions[i - 1]}...v{versions[i]}\n"
+        )
+    if versions:
+        lines.append(f"[{versions[0]}]: {REPO_URL}/releases/tag/v{versions[0]}\n")
+    return "".join(lines)
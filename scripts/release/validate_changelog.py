@@ -0,0 +1,564 @@
+"""This file contains the script to validate our changelog before a release.
+It checks the changelog (and any fragment or archive files) for:
+1. Release headings that are malformed or have invalid versions/dates
+2. Releases that are out of order or duplicated
+3. Released sections that have no entries
+4. Footer links that do not match the releases in the file
+
+Files are validated in parallel and unchanged files are skipped by comparing
+their content hash against a cache, so this can run on every PR.
+Diagnostics are printed as JSON and the exit code is non-zero on errors.
+"""
+
+import argparse
+import hashlib
+import json
+import logging.config
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+import changelog
+from changelog import DELIMITER, REPO_URL
+from packaging import version
+
+config_path = Path.cwd() / "scripts" / "logging_config.ini"
+
+logging.config.fileConfig(config_path)
+
+# Cached results are keyed on the rules too, so changing them revalidates
+RULES_HASH = hashlib.sha256(
+    Path(__file__).read_bytes() + Path(changelog.__file__).read_bytes()
+).hexdigest()
+
+DEFAULT_CHANGELOG = Path("Changelog.md")
+DEFAULT_FRAGMENT_DIRS = (Path("changelog.d"), Path("changelogs"))
+DEFAULT_CACHE = Path(".changelog_cache.json")
+
+RELEASE_PATTERN = re.compile(r"^## \[(.*)\](?: - (.*))?$")
+SECTION_PATTERN = re.compile(r"^### (.*)$")
+LINK_PATTERN = re.compile(r"^\[([^\]]+)\]: (\S+)$")
+DATE_FORMAT = "%Y-%m-%d"
+SECTIONS = ("Added", "Fixed", "Changed", "Removed")
+BULLETS = ("- ", "* ", "+ ")
+UNRELEASED = "Unreleased"
+
+
+@dataclass
+class Diagnostic:
+    """This class represents one problem found in a changelog file"""
+
+    path: str
+    line: int
+    severity: str
+    code: str
+    message: str
+
+
+@dataclass
+class _Release:
+    """A release heading found while scanning a file"""
+
+    name: str
+    line: int
+    parsed_version: version.Version | None = None
+    date: datetime | None = None
+    entries: int = 0
+
+
+class ChangelogValidator:
+    """This class scans the text of a changelog, archive or fragment file
+    line by line and collects diagnostics. Files without any release
+    headings are treated as fragments, which only hold sections and
+    entries for the upcoming release."""
+
+    def __init__(self, path: str, is_main: bool = False) -> None:
+        """Called when validator is created
+
+        Args:
+            path (str): path of the file, used in diagnostics
+            is_main (bool): whether this is the changelog that release_latest
+                updates, which must start with an Unreleased section
+        """
+        self.path = path
+        self.is_main = is_main
+        self.diagnostics = []
+        self.releases = []
+        # Lowercased link label -> (line number, url)
+        self.links = {}
+        self.has_footer = False
+        # Section name -> [line number, entry count] for the current release
+        self.sections = {}
+        self.current = None
+        self.entries = 0
+
+    def _report(self, line: int, code: str, message: str, severity="error"):
+        self.diagnostics.append(Diagnostic(self.path, line, severity, code, message))
+
+    def validate(self, text: str) -> list[Diagnostic]:
+        """Validates the text of the file
+
+        Args:
+            text (str): contents of the file
+
+        Returns:
+            list[Diagnostic]: problems found in the file, sorted by line
+        """
+        lines = text.splitlines()
+        for line_no, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if line == DELIMITER.strip():
+                self.has_footer = True
+            elif self.has_footer:
+                self._parse_link(line_no, line)
+            elif RELEASE_PATTERN.match(line):
+                self._close_release()
+                self._parse_release(line_no, RELEASE_PATTERN.match(line))
+            elif line.startswith("## "):
+                self._report(
+                    line_no,
+                    "malformed-heading",
+                    f"Release heading '{line}' should look like "
+                    "'## [x.y.z] - YYYY-MM-DD'",
+                )
+            elif SECTION_PATTERN.match(line):
+                self._parse_section(line_no, SECTION_PATTERN.match(line).group(1))
+            else:
+                self._parse_entry(line_no, line)
+        self._close_release()
+
+        self._check_file(len(lines))
+        return sorted(self.diagnostics, key=lambda d: d.line)
+
+    def _check_file(self, line_count: int) -> None:
+        """Runs the checks that need the whole file to be scanned first"""
+        # release_latest fails on a changelog without a pending release
+        if self.is_main and (not self.releases or self.releases[0].name != UNRELEASED):
+            self._report(
+                self.releases[0].line if self.releases else 1,
+                "missing-unreleased",
+                f"Changelog must start with a '## [{UNRELEASED}]' section",
+            )
+
+        if self.releases:
+            self._check_release_order()
+            if self.has_footer:
+                self._check_links()
+            else:
+                self._report(
+                    line_count,
+                    "missing-footer",
+                    "Changelog has no footer links",
+                    severity="warning",
+                )
+        elif self.entries == 0 and not self.is_main:
+            self._report(1, "empty-fragment", "Fragment has no entries")
+
+    def _parse_link(self, line_no: int, line: str) -> None:
+        match = LINK_PATTERN.match(line)
+        if not match:
+            return
+        label = match.group(1).lower()
+        if label in self.links:
+            self._report(
+                line_no,
+                "duplicate-link",
+                f"Footer link [{match.group(1)}] is defined twice",
+            )
+        self.links[label] = (line_no, match.group(2))
+
+    def _parse_release(self, line_no: int, match: re.Match) -> None:
+        name, date_text = match.group(1), match.group(2)
+        self.current = _Release(name, line_no)
+        self.releases.append(self.current)
+
+        if name == UNRELEASED:
+            if date_text:
+                self._report(
+                    line_no,
+                    "unreleased-date",
+                    "Unreleased section should not have a release date",
+                )
+            return
+
+        try:
+            self.current.parsed_version = version.parse(name)
+        except version.InvalidVersion:
+            self._report(line_no, "invalid-version", f"'{name}' is not a valid version")
+
+        if not date_text:
+            self._report(line_no, "missing-date", f"Release {name} has no release date")
+            return
+        try:
+            self.current.date = datetime.strptime(date_text, DATE_FORMAT)
+        except ValueError:
+            self._report(
+                line_no,
+                "invalid-date",
+                f"Release {name} has date '{date_text}', expected YYYY-MM-DD",
+            )
+
+    def _parse_section(self, line_no: int, name: str) -> None:
+        if name not in SECTIONS:
+            self._report(
+                line_no,
+                "unknown-section",
+                f"Unknown section '{name}', expected one of {', '.join(SECTIONS)}",
+            )
+        elif name in self.sections:
+            self._report(
+                line_no,
+                "duplicate-section",
+                f"Section '{name}' appears twice in the same release",
+            )
+        self.sections[name] = [line_no, 0]
+
+    def _parse_entry(self, line_no: int, line: str) -> None:
+        # ReleaseLog.parse takes any line in a section as an entry, so only
+        # the bullet style is reported here
+        if self.sections:
+            # Entries belong to the most recently opened section
+            self.sections[next(reversed(self.sections))][1] += 1
+            self.entries += 1
+            if self.current is not None:
+                self.current.entries += 1
+            if not line.startswith("- "):
+                self._report(
+                    line_no,
+                    "bullet-style",
+                    "Entry should start with '- '",
+                    severity="warning",
+                )
+        elif line.startswith(BULLETS) and (self.current or not self.releases):
+            self._report(line_no, "orphan-entry", "Entry is not under any section")
+
+    def _close_release(self) -> None:
+        # Pending sections are left empty as placeholders on purpose
+        is_pending = self.current is not None and self.current.name == UNRELEASED
+        if not is_pending:
+            for name, (line_no, count) in self.sections.items():
+                if count == 0:
+                    self._report(
+                        line_no, "empty-section", f"Section '{name}' has no entries"
+                    )
+        self.sections.clear()
+
+        if self.current is not None and self.current.parsed_version:
+            if self.current.entries == 0:
+                self._report(
+                    self.current.line,
+                    "empty-release",
+                    f"Release {self.current.name} has no entries",
+                )
+
+    def _check_release_order(self) -> None:
+        """Checks releases are unique and listed newest first"""
+        seen = {}
+        previous = None
+        for index, release in enumerate(self.releases):
+            if release.name == UNRELEASED and index != 0:
+                self._report(
+                    release.line,
+                    "unreleased-position",
+                    "Unreleased section must be the first section",
+                )
+
+            key = release.parsed_version or release.name
+            if key in seen:
+                self._report(
+                    release.line,
+                    "duplicate-version",
+                    f"Release {release.name} is already listed on line {seen[key]}",
+                )
+                continue
+            seen[key] = release.line
+
+            if release.parsed_version is None:
+                continue
+            if previous is not None:
+                if release.parsed_version >= previous.parsed_version:
+                    self._report(
+                        release.line,
+                        "version-order",
+                        f"Release {release.name} should be listed before "
+                        f"{previous.name}",
+                    )
+                elif release.date and previous.date and release.date > previous.date:
+                    self._report(
+                        release.line,
+                        "date-order",
+                        f"Release {release.name} is dated after the newer "
+                        f"release {previous.name}",
+                    )
+            previous = release
+
+    def _check_links(self) -> None:
+        """Checks the footer links match the releases in the file"""
+        names = {release.name.lower() for release in self.releases}
+        expected = self._expected_links()
+        # Report each missing label once, on the first release using it
+        first_releases = {}
+        for release in self.releases:
+            first_releases.setdefault(release.name.lower(), release)
+        for label in expected:
+            if label not in self.links:
+                release = first_releases[label]
+                self._report(
+                    release.line,
+                    "missing-link",
+                    f"Release {release.name} has no link in the footer",
+                )
+
+        for label, (line_no, _) in self.links.items():
+            if label not in names:
+                self._report(
+                    line_no,
+                    "stale-link",
+                    f"Footer link [{label}] does not match any release",
+                    severity="warning",
+                )
+
+        for label, url in expected.items():
+            if label not in self.links:
+                continue
+            line_no, actual = self.links[label]
+            if actual != url:
+                self._report(
+                    line_no,
+                    "link-mismatch",
+                    f"Footer link [{label}] should be {url}",
+                )
+
+    def _expected_links(self) -> dict:
+        """Builds the footer links from the release order, in the same way
+        as Changelog.format_diff_text
+
+        Returns:
+            dict: lowercased link label -> expected url
+        """
+        # Walk the releases oldest first, skipping duplicates, so each
+        # release compares against the one listed below it
+        releases = []
+        for release in reversed(self.releases):
+            if release.name.lower() not in {r.name.lower() for r in releases}:
+                releases.append(release)
+        expected = {}
+        for older, release in zip([None] + releases, releases):
+            label = release.name.lower()
+            if release.name == UNRELEASED:
+                if older is not None:
+                    expected[label] = f"{REPO_URL}/compare/v{older.name}...HEAD"
+            elif older is None:
+                expected[label] = f"{REPO_URL}/releases/tag/v{release.name}"
+            else:
+                expected[label] = f"{REPO_URL}/compare/v{older.name}...v{release.name}"
+        return expected
+
+
+def validate_text(path: str, text: str, is_main: bool = False) -> list[Diagnostic]:
+    """Validates the text of a changelog, archive or fragment file
+
+    Args:
+        path (str): path of the file, used in diagnostics
+        text (str): contents of the file
+        is_main (bool): whether this is the changelog that release_latest
+            updates, which must start with an Unreleased section
+
+    Returns:
+        list[Diagnostic]: problems found in the file
+    """
+    return ChangelogValidator(path, is_main).validate(text)
+
+
+def _validate_file(path: str, text: str) -> list[dict]:
+    """Worker entry point, returns plain dicts so results pickle cheaply"""
+    is_main = Path(path).name == DEFAULT_CHANGELOG.name
+    return [asdict(diagnostic) for diagnostic in validate_text(path, text, is_main)]
+
+
+def content_hash(text: str) -> str:
+    """Returns the cache key for the contents of a file
+
+    Args:
+        text (str): contents of the file
+
+    Returns:
+        str: hash of the contents and the validator rules
+    """
+    digest = hashlib.sha256(RULES_HASH.encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_cache(path: Path) -> dict:
+    """Loads cached results, returning an empty cache if it is unusable
+
+    Args:
+        path (Path): path to cache file
+
+    Returns:
+        dict: file path -> {"hash": str, "diagnostics": list}
+    """
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="UTF-8") as file:
+            cache = json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable cache at {path}: {e}")
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    """Saves results so unchanged files can be skipped next run
+
+    Args:
+        path (Path): path to cache file
+        cache (dict): file path -> {"hash": str, "diagnostics": list}
+    """
+    with open(path, "w", encoding="UTF-8") as file:
+        json.dump(cache, file, indent=2, sort_keys=True)
+
+
+def collect_files(paths: list[Path]) -> list[Path]:
+    """Expands directories into the markdown files they contain
+
+    Args:
+        paths (list[Path]): files or directories to validate
+
+    Returns:
+        list[Path]: markdown files to validate, without duplicates
+    """
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.md")))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def validate_files(files: list[Path], cache: dict, jobs: int | None) -> dict:
+    """Validates files in parallel, reusing cached results for files
+    whose contents have not changed
+
+    Args:
+        files (list[Path]): files to validate
+        cache (dict): cached results, updated in place
+        jobs (int | None): number of worker processes, None for cpu count
+
+    Returns:
+        dict: summary with diagnostics for every file
+    """
+    diagnostics = []
+    to_validate = {}
+    skipped = []
+
+    for file_path in files:
+        key = file_path.as_posix()
+        if not file_path.exists():
+            diagnostics.append(
+                asdict(Diagnostic(key, 0, "error", "missing-file", "File not found"))
+            )
+            continue
+        text = file_path.read_text(encoding="UTF-8")
+        file_hash = content_hash(text)
+        cached = cache.get(key)
+        if cached and cached.get("hash") == file_hash:
+            skipped.append(key)
+            diagnostics.extend(cached["diagnostics"])
+        else:
+            to_validate[key] = (file_hash, text)
+
+    if len(to_validate) == 1 or jobs == 1:
+        results = {
+            key: _validate_file(key, text) for key, (_, text) in to_validate.items()
+        }
+    elif to_validate:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                key: executor.submit(_validate_file, key, text)
+                for key, (_, text) in to_validate.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+    else:
+        results = {}
+
+    for key, file_diagnostics in results.items():
+        cache[key] = {"hash": to_validate[key][0], "diagnostics": file_diagnostics}
+        diagnostics.extend(file_diagnostics)
+
+    return {
+        "validated": sorted(results),
+        "skipped": sorted(skipped),
+        "errors": sum(d["severity"] == "error" for d in diagnostics),
+        "warnings": sum(d["severity"] == "warning" for d in diagnostics),
+        "diagnostics": diagnostics,
+    }
+
+
+def get_args():
+    """Parses and returns the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Validates the changelog and any fragment or archive files."
+            " Prints diagnostics as JSON and exits with 1 if there are errors."
+        )
+    )
+    parser.add_argument(
+        "paths",
+        type=Path,
+        nargs="*",
+        help=(
+            "Files or directories to validate, defaults to Changelog.md and "
+            "any changelog.d/ or changelogs/ directories"
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_CACHE,
+        help="File to store content hashes in so unchanged files are skipped",
+    )
+    parser.add_argument("--no_cache", action="store_true", help="Validate every file")
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Number of worker processes"
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Treat warnings as errors"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to validate the changelog files."""
+    args = get_args()
+
+    paths = args.paths or [DEFAULT_CHANGELOG] + [
+        path for path in DEFAULT_FRAGMENT_DIRS if path.is_dir()
+    ]
+    files = collect_files(paths)
+    cache = {} if args.no_cache else load_cache(args.cache)
+
+    summary = validate_files(files, cache, args.jobs)
+
+    if not args.no_cache:
+        save_cache(args.cache, cache)
+
+    print(json.dumps(summary, indent=2))
+    failed = summary["errors"] or (args.strict and summary["warnings"])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Tests for the changelog validator. Run from the root of the repository:
+python -m unittest discover -s scripts/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "release"))
+
+# pylint: disable=wrong-import-position,import-error
+from changelog import REPO_URL, Changelog
+from validate_changelog import validate_files, validate_text
+
+# pylint: enable=wrong-import-position,import-error
+
+UNRELEASED = (
+    "## [Unreleased]\n\n### Added\n\n### Fixed\n\n### Changed\n\n### Removed\n\n"
+)
+
+RELEASES = (
+    "## [1.1.0] - 2025-03-25\n\n"
+    "### Added\n\n"
+    "- (FE) Expense splitting\n\n"
+    "## [1.0.0] - 2025-03-12\n\n"
+    "### Fixed\n\n"
+    "- (BE) Itinerary visibility\n\n"
+)
+
+FOOTER = (
+    "---\n"
+    f"[unreleased]: {REPO_URL}/compare/v1.1.0...HEAD\n"
+    f"[1.1.0]: {REPO_URL}/compare/v1.0.0...v1.1.0\n"
+    f"[1.0.0]: {REPO_URL}/releases/tag/v1.0.0\n"
+)
+
+# pylint: disable-next=protected-access
+VALID = Changelog._FILE_HEADER + UNRELEASED + RELEASES + FOOTER
+
+
+def _replace(old: str, new: str) -> str:
+    assert old in VALID, old
+    return VALID.replace(old, new)
+
+
+class ValidateChangelogTest(unittest.TestCase):
+    """Tests the diagnostics reported by validate_text"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def codes(self, text: str, is_main: bool = True) -> set:
+        """Returns the diagnostic codes reported for a text"""
+        return {d.code for d in validate_text("Changelog.md", text, is_main)}
+
+    def save_and_validate(self, text: str) -> list:
+        """Round trips a text through Changelog.save_file and validates it"""
+        path = self.dir / "Changelog.md"
+        path.write_text(text, encoding="UTF-8")
+        changelog = Changelog(path)
+        changelog.save_file()
+        return validate_text(str(path), path.read_text(encoding="UTF-8"), True)
+
+    def test_valid_changelog(self):
+        """A well formed changelog has no diagnostics"""
+        self.assertEqual(self.codes(VALID), set())
+
+    def test_save_file_round_trip(self):
+        """save_file output is valid and unchanged"""
+        self.assertEqual(self.save_and_validate(VALID), [])
+        saved = (self.dir / "Changelog.md").read_text(encoding="UTF-8")
+        self.assertEqual(saved, VALID)
+
+    def test_save_file_before_first_release(self):
+        """save_file output with only an Unreleased section is valid"""
+        self.assertEqual(self.save_and_validate(UNRELEASED), [])
+
+    def test_save_file_after_release_latest(self):
+        """save_file output after release_latest is valid"""
+        path = self.dir / "Changelog.md"
+        path.write_text(
+            VALID.replace("### Added\n\n### Fixed", "### Added\n\n- New\n\n### Fixed"),
+            encoding="UTF-8",
+        )
+        changelog = Changelog(path)
+        changelog.release_latest("1.2.0", "2025-04-01")
+        changelog.save_file()
+        text = path.read_text(encoding="UTF-8")
+        self.assertEqual(validate_text(str(path), text, True), [])
+
+    def test_fragment_and_archive(self):
+        """Fragments and archives do not need an Unreleased section"""
+        self.assertEqual(self.codes("### Added\n\n- New thing\n", False), set())
+        archive = Changelog._FILE_HEADER + RELEASES  # pylint: disable=protected-access
+        archive += "---\n" + FOOTER.split("\n", 2)[2]
+        self.assertEqual(self.codes(archive, False), set())
+
+    def test_bullet_style_is_not_empty(self):
+        """Other bullets count as entries, with a warning"""
+        codes = self.codes(_replace("- (FE) Expense", "* (FE) Expense"))
+        self.assertEqual(codes, {"bullet-style"})
+
+    def test_diagnostics(self):
+        """Each diagnostic is reported for a changelog that breaks its rule"""
+        cases = {
+            "unreleased-date": _replace(
+                "## [Unreleased]", "## [Unreleased] - 2025-04-01"
+            ),
+            "invalid-version": _replace("## [1.0.0]", "## [abc]"),
+            "missing-date": _replace("## [1.0.0] - 2025-03-12", "## [1.0.0]"),
+            "invalid-date": _replace("2025-03-12", "2025-13-12"),
+            "unreleased-position": _replace(
+                "## [1.0.0]", "## [Unreleased]\n\n### Added\n\n## [1.0.0]"
+            ),
+            "duplicate-version": _replace("## [1.0.0]", "## [1.1.0]"),
+            "version-order": _replace("## [1.0.0]", "## [1.2.0]"),
+            "date-order": _replace("2025-03-12", "2025-04-12"),
+            "missing-link": _replace(f"[1.0.0]: {REPO_URL}", "[x]: "),
+            "stale-link": VALID + "[0.9.0]: https://example.com\n",
+            "link-mismatch": _replace("v1.0.0...v1.1.0", "v0.5.0...v1.1.0"),
+            "duplicate-link": VALID + f"[1.0.0]: {REPO_URL}/releases/tag/v1.0.0\n",
+            "malformed-heading": _replace("## [1.0.0]", "## 1.0.0"),
+            "unknown-section": _replace(
+                "### Fixed\n\n- (BE)", "### Security\n\n- (BE)"
+            ),
+            "duplicate-section": _replace(
+                "- (BE) Itinerary visibility\n",
+                "- (BE) Itinerary visibility\n\n### Fixed\n\n- (BE) More\n",
+            ),
+            "bullet-style": _replace("- (FE) Expense", "+ (FE) Expense"),
+            "orphan-entry": _replace(
+                "2025-03-12\n\n### Fixed", "2025-03-12\n\n- Stray\n\n### Fixed"
+            ),
+            "empty-section": _replace(
+                "- (BE) Itinerary visibility\n",
+                "- (BE) Itinerary visibility\n\n### Removed\n",
+            ),
+            "empty-release": _replace("### Fixed\n\n- (BE) Itinerary visibility\n", ""),
+            "missing-footer": VALID.split("---\n", maxsplit=1)[0],
+            "missing-unreleased": _replace(UNRELEASED, ""),
+        }
+        for code, text in cases.items():
+            with self.subTest(code=code):
+                self.assertIn(code, self.codes(text))
+
+    def test_unreleased_link_mismatch(self):
+        """The unreleased link is compared against the latest release"""
+        text = _replace("v1.1.0...HEAD", "v0.9.0...HEAD")
+        self.assertEqual(self.codes(text), {"link-mismatch"})
+
+    def test_empty_main_changelog(self):
+        """An empty changelog has no release to release"""
+        self.assertEqual(self.codes(""), {"missing-unreleased"})
+
+    def test_empty_fragment(self):
+        """A fragment without entries is reported"""
+        self.assertEqual(self.codes("", False), {"empty-fragment"})
+        codes = self.codes("### Added\n", False)
+        self.assertEqual(codes, {"empty-fragment", "empty-section"})
+
+
+class ValidateFilesTest(unittest.TestCase):
+    """Tests caching and file handling in validate_files"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.changelog = self.dir / "Changelog.md"
+        self.changelog.write_text(VALID, encoding="UTF-8")
+        self.fragment = self.dir / "fragment.md"
+        self.fragment.write_text("### Added\n", encoding="UTF-8")
+
+    def test_cache_hit_and_miss(self):
+        """Only files whose contents changed are validated again"""
+        cache = {}
+        files = [self.changelog, self.fragment]
+
+        summary = validate_files(files, cache, jobs=2)
+        self.assertEqual(len(summary["validated"]), 2)
+        self.assertEqual(summary["errors"], 2)
+
+        summary = validate_files(files, cache, jobs=2)
+        self.assertEqual(summary["validated"], [])
+        self.assertEqual(len(summary["skipped"]), 2)
+        self.assertEqual(summary["errors"], 2)
+
+        self.fragment.write_text("### Added\n\n- New thing\n", encoding="UTF-8")
+        summary = validate_files(files, cache, jobs=1)
+        self.assertEqual(summary["validated"], [self.fragment.as_posix()])
+        self.assertEqual(summary["errors"], 0)
+
+    def test_main_changelog_requires_unreleased(self):
+        """Changelog.md must start with an Unreleased section"""
+        self.changelog.write_text(_replace(UNRELEASED, ""), encoding="UTF-8")
+        summary = validate_files([self.changelog], {}, jobs=1)
+        codes = {d["code"] for d in summary["diagnostics"]}
+        self.assertIn("missing-unreleased", codes)
+
+    def test_missing_file(self):
+        """Missing files are reported instead of raising"""
+        summary = validate_files([self.dir / "missing.md"], {}, jobs=1)
+        self.assertEqual(summary["diagnostics"][0]["code"], "missing-file")
+
+
+if __name__ == "__main__":
+    unittest.main()